@@ -1,61 +1,12 @@
+import math
 import pandas as pd
 import numpy as np
-from datetime import datetime
-from sklearn.linear_model import LinearRegression
 import warnings
-import os
 warnings.filterwarnings('ignore')
 
-def load_price_data(csv_file='Nat_Gas.csv'):
-    """Load and prepare natural gas price data"""
-    if not os.path.exists(csv_file):
-        raise FileNotFoundError(f"CSV file '{csv_file}' not found")
-    
-    df = pd.read_csv(csv_file)
-    df['Dates'] = pd.to_datetime(df['Dates'])
-    df['Prices'] = df['Prices'].astype(float)
-    df['Month'] = df['Dates'].dt.month
-    df['Year'] = df['Dates'].dt.year
-    df['DayOfYear'] = df['Dates'].dt.dayofyear
-    df['TimeIndex'] = range(len(df))
-    return df
-
-def build_price_model(df):
-    """Build Fourier series-based price forecasting model"""
-    X = np.column_stack([
-        df['TimeIndex'],
-        np.sin(2 * np.pi * df['DayOfYear'] / 365.25),
-        np.cos(2 * np.pi * df['DayOfYear'] / 365.25),
-        np.sin(4 * np.pi * df['DayOfYear'] / 365.25),
-        np.cos(4 * np.pi * df['DayOfYear'] / 365.25),
-        df['Month']
-    ])
-    y = df['Prices']
-    model = LinearRegression()
-    model.fit(X, y)
-    return model
-
-def estimate_price(date_str, model, reference_date, last_time_index):
-    """Estimate price for any date using the Fourier series model (monthly data)"""
-    target_date = pd.to_datetime(date_str)
-    
-    # Calculate months difference for monthly data
-    months_diff = (target_date.year - reference_date.year) * 12 + (target_date.month - reference_date.month)
-    time_index = last_time_index + months_diff
-    
-    day_of_year = target_date.dayofyear
-    month = target_date.month
-
-    features = np.array([[ 
-        time_index,
-        np.sin(2 * np.pi * day_of_year / 365.25),
-        np.cos(2 * np.pi * day_of_year / 365.25),
-        np.sin(4 * np.pi * day_of_year / 365.25),
-        np.cos(4 * np.pi * day_of_year / 365.25),
-        month
-    ]])
-    price = model.predict(features)[0]
-    return max(0, price)
+from pricing_core import (load_data as load_price_data,
+                          build_model as build_price_model,
+                          estimate_price, estimate_prices, _get_model)
 
 def price_storage_contract(injection_dates: list,
                           withdrawal_dates: list,
@@ -101,127 +52,91 @@ def price_storage_contract(injection_dates: list,
     if len(injection_dates) == 0 or len(withdrawal_dates) == 0:
         raise ValueError("Must have at least one injection and withdrawal date")
     
-    # Validate and convert dates
+    # Validate and convert dates in one vectorized call; the explicit format
+    # skips pandas' per-string inference and cache=True dedupes repeats
     try:
-        injection_dates_parsed = [pd.to_datetime(date) for date in injection_dates]
-        withdrawal_dates_parsed = [pd.to_datetime(date) for date in withdrawal_dates]
+        injection_dates_parsed = pd.to_datetime(injection_dates, format='%Y-%m-%d', cache=True)
+        withdrawal_dates_parsed = pd.to_datetime(withdrawal_dates, format='%Y-%m-%d', cache=True)
     except:
         raise ValueError("Invalid date format. Use 'YYYY-MM-DD' format")
     
-    # Validate volumes are positive
-    for volume in injection_volumes:
-        if volume <= 0:
-            raise ValueError(f"Injection volume {volume} must be positive")
-    
-    for volume in withdrawal_volumes:
-        if volume <= 0:
-            raise ValueError(f"Withdrawal volume {volume} must be positive")
-    
-    # Check if total withdrawals equal total injections
-    total_injection_volume = sum(injection_volumes)
-    total_withdrawal_volume = sum(withdrawal_volumes)
-    
-    if abs(total_injection_volume - total_withdrawal_volume) > 1e-6:  # Allow for floating point precision
+    # Validate volumes are positive with one vectorized comparison per list
+    injection_volumes_arr = np.asarray(injection_volumes, dtype=np.float64)
+    withdrawal_volumes_arr = np.asarray(withdrawal_volumes, dtype=np.float64)
+    bad_injections = injection_volumes_arr <= 0
+    if bad_injections.any():
+        raise ValueError(f"Injection volume {injection_volumes[int(np.argmax(bad_injections))]} must be positive")
+    bad_withdrawals = withdrawal_volumes_arr <= 0
+    if bad_withdrawals.any():
+        raise ValueError(f"Withdrawal volume {withdrawal_volumes[int(np.argmax(bad_withdrawals))]} must be positive")
+
+    # Check if total withdrawals equal total injections (allow floating point precision)
+    total_injection_volume = float(injection_volumes_arr.sum())
+    total_withdrawal_volume = float(withdrawal_volumes_arr.sum())
+
+    if not math.isclose(total_injection_volume, total_withdrawal_volume, abs_tol=1e-6):
         raise ValueError(f"Total injection volume ({total_injection_volume}) must equal total withdrawal volume ({total_withdrawal_volume})")
     
-    # Create operations list
-    operations = []
-    
-    # Add injection operations
-    for i, (date, volume) in enumerate(zip(injection_dates_parsed, injection_volumes)):
-        operations.append({
-            'date': date,
-            'type': 'injection',
-            'volume': volume,
-            'index': i
-        })
-    
-    # Add withdrawal operations
-    for i, (date, volume) in enumerate(zip(withdrawal_dates_parsed, withdrawal_volumes)):
-        operations.append({
-            'date': date,
-            'type': 'withdrawal',
-            'volume': volume,
-            'index': i
-        })
-    
-    # Sort operations by date
-    operations.sort(key=lambda x: x['date'])
-    
-    # Check storage capacity constraints
-    current_storage = 0
-    for op in operations:
-        if op['type'] == 'injection':
-            current_storage += op['volume']
-            if current_storage > max_storage_capacity:
-                raise ValueError(f"Storage capacity {max_storage_capacity} exceeded by injection on {op['date']}")
-        else:  # withdrawal
-            current_storage -= op['volume']
-            if current_storage < 0:
-                raise ValueError(f"Cannot withdraw {op['volume']} on {op['date']}: insufficient storage")
-    
-    # Load price data and build model
-    price_df = load_price_data(csv_file)
-    price_model = build_price_model(price_df)
-    reference_date = price_df['Dates'].iloc[-1]
-    last_time_index = price_df['TimeIndex'].iloc[-1]
-    
-    # Helper function to get price for a date using the model
-    def get_price(date_str):
-        return estimate_price(date_str, price_model, reference_date, last_time_index)
-    
-    # Calculate cash flows
-    total_purchase_cost = 0
-    total_sale_revenue = 0
-    total_injection_cost = 0
-    total_withdrawal_cost = 0
-    total_transport_cost = 0
-    
-    injection_details = []
-    withdrawal_details = []
-    
-    # Process injections
-    for i, (date, volume) in enumerate(zip(injection_dates, injection_volumes)):
-        price = get_price(date)
-        cost = volume * price
-        total_purchase_cost += cost
-        total_injection_cost += (volume / 1_000_000) * storage_costs['injection_cost']
-        total_transport_cost += storage_costs['transport_cost_per_trip']
-        
-        injection_details.append({
-            'date': date,
-            'volume': volume,
-            'price': price,
-            'cost': cost
-        })
-    
-    # Process withdrawals
-    for i, (date, volume) in enumerate(zip(withdrawal_dates, withdrawal_volumes)):
-        price = get_price(date)
-        revenue = volume * price
-        total_sale_revenue += revenue
-        total_withdrawal_cost += (volume / 1_000_000) * storage_costs['withdrawal_cost']
-        total_transport_cost += storage_costs['transport_cost_per_trip']
-        
-        withdrawal_details.append({
-            'date': date,
-            'volume': volume,
-            'price': price,
-            'revenue': revenue
-        })
-    
+    # Operations as parallel arrays (dates, volumes, direction) instead of a list of dicts
+    n_injections = len(injection_dates)
+    all_op_dates = np.concatenate([
+        injection_dates_parsed.to_numpy(),
+        withdrawal_dates_parsed.to_numpy()
+    ]).astype('datetime64[D]')
+    all_op_volumes = np.concatenate([injection_volumes_arr, withdrawal_volumes_arr])
+    is_injection = np.zeros(len(all_op_dates), dtype=bool)
+    is_injection[:n_injections] = True
+
+    # Stable sort keeps injections ahead of withdrawals on the same date
+    order = np.argsort(all_op_dates, kind='stable')
+
+    # Check storage capacity constraints with a single C-level cumulative sum
+    signed_volumes = np.where(is_injection[order], all_op_volumes[order], -all_op_volumes[order])
+    running_storage = np.cumsum(signed_volumes)
+    if running_storage.max() > max_storage_capacity:
+        idx = order[int(np.argmax(running_storage))]
+        raise ValueError(f"Storage capacity {max_storage_capacity} exceeded by injection on {all_op_dates[idx]}")
+    if running_storage.min() < 0:
+        idx = order[int(np.argmin(running_storage))]
+        raise ValueError(f"Cannot withdraw {all_op_volumes[idx]} on {all_op_dates[idx]}: insufficient storage")
+    
+    # Load price data and build model (cached across calls until the CSV changes)
+    price_model, reference_date, last_time_index = _get_model(csv_file)
+
+    # Estimate prices for all operation dates with a single model prediction
+    all_prices = estimate_prices(pd.DatetimeIndex(all_op_dates), price_model, reference_date, last_time_index)
+    injection_prices = all_prices[:n_injections]
+    withdrawal_prices = all_prices[n_injections:]
+
+    # Calculate cash flows as vector reductions over the batched prices
+    total_purchase_cost = float(injection_volumes_arr @ injection_prices)
+    total_sale_revenue = float(withdrawal_volumes_arr @ withdrawal_prices)
+    total_injection_cost = float(injection_volumes_arr.sum()) / 1_000_000 * storage_costs['injection_cost']
+    total_withdrawal_cost = float(withdrawal_volumes_arr.sum()) / 1_000_000 * storage_costs['withdrawal_cost']
+    total_transport_cost = len(all_op_dates) * storage_costs['transport_cost_per_trip']
+
+    injection_details = [
+        {'date': date, 'volume': volume, 'price': price, 'cost': volume * price}
+        for date, volume, price in zip(injection_dates, injection_volumes, injection_prices)
+    ]
+    withdrawal_details = [
+        {'date': date, 'volume': volume, 'price': price, 'revenue': volume * price}
+        for date, volume, price in zip(withdrawal_dates, withdrawal_volumes, withdrawal_prices)
+    ]
+
     # Calculate storage duration - from first injection to last withdrawal
-    first_injection_date = min(injection_dates_parsed)
-    last_withdrawal_date = max(withdrawal_dates_parsed)
-    
+    first_injection_date = all_op_dates[:n_injections].min()
+    last_withdrawal_date = all_op_dates[n_injections:].max()
+
     if last_withdrawal_date < first_injection_date:
         raise ValueError("Last withdrawal date must be after first injection date")
-    
-    # Calculate duration in months
-    duration_months = (last_withdrawal_date.year - first_injection_date.year) * 12 + (last_withdrawal_date.month - first_injection_date.month)
-    if duration_months == 0:
-        duration_months = 1  # Minimum 1 month storage
-    
+
+    # Calculate duration in months: a single int64 subtraction on datetime64[M]
+    # scalars instead of four Timestamp attribute lookups
+    duration_months = int(last_withdrawal_date.astype('datetime64[M]') -
+                          first_injection_date.astype('datetime64[M]'))
+    duration_months = max(duration_months, 1)  # Minimum 1 month storage
+
     total_storage_cost = duration_months * storage_costs['monthly_storage_fee']
     
     # Calculate final contract value
@@ -0,0 +1,238 @@
+"""Shared price-model core used by forecasting.py and storage_contract.py.
+
+Loading, model fitting and price estimation used to be duplicated in both
+modules, which meant the model cache could never be shared between the
+interactive tool and the contract pricer. This module holds the single
+canonical implementation.
+"""
+import functools
+import math
+import os
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from types import SimpleNamespace
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Angular frequency of the annual cycle in rad/day; precomputed so hot paths
+# multiply by a constant instead of dividing by 365.25 each time
+_OMEGA = 2.0 * math.pi / 365.25
+
+def _sincos(angle):
+    """Evaluate sin and cos of the same angle array in one place.
+
+    NumPy has no public fused sincos, so this is the single seam where an
+    MKL/SLEEF-backed implementation could be swapped in; the second
+    harmonic is always derived from this pair via double-angle identities
+    rather than a second argument reduction.
+    """
+    return np.sin(angle), np.cos(angle)
+
+# Reusable design-matrix buffer for _fourier_features, grown on demand so
+# steady-state feature builds allocate nothing. Not thread-safe: concurrent
+# callers would share rows — make it a threading.local if that ever matters.
+_X_BUF = np.empty((0, 6), dtype=np.float64)
+
+def _feature_buffer(n):
+    global _X_BUF
+    if _X_BUF.shape[0] < n:
+        _X_BUF = np.empty((n, 6), dtype=np.float64)
+    return _X_BUF[:n]
+
+if njit is not None:
+    # Single fused loop over the rows: one sin/cos pair per row and no
+    # intermediate arrays, compiled once and cached on disk
+    @njit(cache=True, fastmath=True)
+    def _fill_fourier_features(time_index, doy, month, out):
+        for i in range(doy.shape[0]):
+            angle = _OMEGA * doy[i]
+            sin1 = math.sin(angle)
+            cos1 = math.cos(angle)
+            out[i, 0] = time_index[i]
+            out[i, 1] = sin1
+            out[i, 2] = cos1
+            out[i, 3] = 2 * sin1 * cos1
+            out[i, 4] = 1 - 2 * sin1 * sin1
+            out[i, 5] = month[i]
+
+    def _fourier_features(time_index, doy, month):
+        """Build the 6-column Fourier design matrix with the compiled kernel"""
+        out = _feature_buffer(doy.shape[0])
+        _fill_fourier_features(time_index, doy, month, out)
+        return out
+else:
+    def _fourier_features(time_index, doy, month):
+        """Build the 6-column Fourier design matrix with vectorized NumPy"""
+        angle = _OMEGA * doy
+        sin1, cos1 = _sincos(angle)
+        out = _feature_buffer(doy.shape[0])
+        out[:, 0] = time_index
+        out[:, 1] = sin1
+        out[:, 2] = cos1
+        out[:, 3] = 2 * sin1 * cos1
+        out[:, 4] = 1 - 2 * sin1 * sin1
+        out[:, 5] = month
+        return out
+
+class _PriceModel:
+    """Fitted-model container exposing sklearn-style coef_/intercept_.
+
+    Hashes by identity so it can serve as an lru_cache key for memoized
+    price lookups.
+    """
+    __slots__ = ('coef_', 'intercept_', '_w', '_wt', '_b')
+
+    def __init__(self, coef, intercept):
+        self.coef_ = self._w = coef
+        # Plain-float tuple for the scalar path: indexing it yields Python
+        # floats directly instead of boxing numpy scalars
+        self._wt = tuple(map(float, coef))
+        self.intercept_ = self._b = intercept
+
+def _parse_csv_date(text):
+    """Parse a CSV date in either the dataset's m/d/yy or ISO format"""
+    for fmt in ('%m/%d/%y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognized date format: {text!r}")
+
+def load_data(csv_file='Nat_Gas.csv', verbose=False):
+    """Load and prepare natural gas price data as plain NumPy arrays.
+
+    Returns a namespace with dates (datetime64[D]), prices, day_of_year,
+    month, year and time_index arrays. For a few hundred monthly rows the
+    DataFrame construction and accessor chain dominated load time, so no
+    DataFrame is built at all.
+    """
+    if not os.path.exists(csv_file):
+        raise FileNotFoundError(f"CSV file '{csv_file}' not found")
+
+    raw = np.loadtxt(csv_file, delimiter=',', skiprows=1, dtype=str)
+    dates = np.array([_parse_csv_date(d).date() for d in raw[:, 0]], dtype='datetime64[D]')
+    prices = raw[:, 1].astype(np.float64)
+
+    # Calendar columns via integer datetime64 arithmetic, no .dt accessors
+    day_of_year = (dates - dates.astype('datetime64[Y]').astype('datetime64[D]')).astype(np.int64) + 1
+    month = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    year = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    time_index = np.arange(len(dates))
+
+    if verbose:
+        print(f"Loaded {len(dates)} data points from {dates.min()} to {dates.max()}")
+    return SimpleNamespace(dates=dates, prices=prices, day_of_year=day_of_year,
+                           month=month, year=year, time_index=time_index)
+
+def build_model(data, verbose=False):
+    """Build Fourier series-based price forecasting model"""
+    X = _fourier_features(data.time_index.astype(np.float64),
+                          data.day_of_year.astype(np.float64),
+                          data.month.astype(np.float64))
+    y = data.prices
+
+    # Solve the normal equations of the intercept-augmented system directly;
+    # a symmetric 7x7 solve is far cheaper than sklearn's SVD-based fit
+    Xa = np.empty((len(X), 7), dtype=np.float64)
+    Xa[:, 0] = 1.0
+    Xa[:, 1:] = X
+    beta = np.linalg.solve(Xa.T @ Xa, Xa.T @ y)
+
+    if verbose:
+        residual = y - Xa @ beta
+        centered = y - y.mean()
+        r2 = 1 - (residual @ residual) / (centered @ centered)
+        print(f"Model R² score: {r2:.3f}")
+
+    return _PriceModel(beta[1:], float(beta[0]))
+
+@functools.lru_cache(maxsize=4)
+def _get_cached_model(csv_file, mtime):
+    """Load data and fit the model once per (csv_file, mtime) combination"""
+    data = load_data(csv_file)
+    model = build_model(data)
+    return model, pd.Timestamp(data.dates[-1]), int(data.time_index[-1])
+
+def _get_model(csv_file):
+    """Return cached (model, reference_date, last_time_index) for a CSV file"""
+    if not os.path.exists(csv_file):
+        raise FileNotFoundError(f"CSV file '{csv_file}' not found")
+    return _get_cached_model(csv_file, os.path.getmtime(csv_file))
+
+def _predict_scalar(time_index, doy, month, w, b):
+    """Evaluate the fitted model for one (time_index, day-of-year, month).
+
+    math.sin/math.cos beat the numpy ufuncs by ~10x on scalars, and the
+    double-angle identities cover the second harmonic from one sin/cos pair.
+    Compiled with numba when available, which drops per-call latency to the
+    microsecond range for backtests issuing millions of lookups.
+    """
+    angle = _OMEGA * doy
+    sin1 = math.sin(angle)
+    cos1 = math.cos(angle)
+    return max(0.0, b + w[0] * time_index +
+               w[1] * sin1 + w[2] * cos1 +
+               w[3] * (2 * sin1 * cos1) + w[4] * (1 - 2 * sin1 * sin1) +
+               w[5] * month)
+
+if njit is not None:
+    _predict_scalar = njit(cache=True)(_predict_scalar)
+
+@functools.lru_cache(maxsize=None)
+def _month_price(year, month, model, reference_date, last_time_index):
+    """Cached price for a (year, month) pair, evaluated at mid-month.
+
+    The underlying data is monthly, so intra-month day-of-year variation is
+    below the model's resolution; pricing every date in a month at its 15th
+    makes repeat lookups a dict hit.
+    """
+    months_diff = (year - reference_date.year) * 12 + (month - reference_date.month)
+    time_index = last_time_index + months_diff
+    day_of_year = pd.Timestamp(year, month, 15).dayofyear
+    return _predict_scalar(float(time_index), float(day_of_year), float(month),
+                           model._wt, model._b)
+
+def estimate_price(date_str, model, reference_date, last_time_index):
+    """Estimate price for any date using the Fourier series model (monthly data)
+
+    Accepts a 'YYYY-MM-DD' string or an already-parsed Timestamp/datetime64,
+    so callers holding parsed dates don't pay a second pd.to_datetime.
+    """
+    if isinstance(date_str, str):
+        target_date = pd.to_datetime(date_str)
+    else:
+        target_date = pd.Timestamp(date_str)
+    return _month_price(target_date.year, target_date.month,
+                        model, reference_date, last_time_index)
+
+def estimate_prices(dates, model, reference_date, last_time_index):
+    """Estimate prices for many dates at once with a single model prediction.
+
+    Like estimate_price, all dates in the same calendar month share one
+    mid-month prediction, so the model runs on unique months only.
+    """
+    dates = pd.DatetimeIndex(dates)
+    months = dates.to_numpy().astype('datetime64[M]')
+    unique_months, inverse = np.unique(months, return_inverse=True)
+
+    # Month number, months-since-reference and mid-month day-of-year per unique month
+    month = unique_months.astype(np.int64) % 12 + 1
+    year_month = unique_months.astype(np.int64) + 1970 * 12 + 1
+    months_diff = year_month - (reference_date.year * 12 + reference_date.month)
+    time_index = last_time_index + months_diff
+    day_of_year = (unique_months.astype('datetime64[D]') -
+                   unique_months.astype('datetime64[Y]').astype('datetime64[D]')).astype(np.int64) + 15
+
+    X = _fourier_features(time_index.astype(np.float64),
+                          day_of_year.astype(np.float64),
+                          month.astype(np.float64))
+    prices = model._b + X @ model._w
+    # In-place branchless clip: one vectorized fmax pass, no extra allocation
+    np.maximum(0.0, prices, out=prices)
+    return prices[inverse]